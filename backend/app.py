@@ -1,15 +1,24 @@
+import hashlib
 import logging
+import os
 from pathlib import Path
+from typing import Dict, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse
+import orjson
 import uvicorn
+import xxhash
+
+from backend.core.config import settings
+from backend.utils.http_cache import etag_matches, not_modified
+from backend.utils.static_files import CachedStaticFiles
 
 # Import Routers
 from backend.routers import transactions, ai_insights, chat, invoices, accounts, privacy, holistic, voice
@@ -20,16 +29,27 @@ logger = logging.getLogger(__name__)
 
 from contextlib import asynccontextmanager
 from backend.core.database import connect_to_mongo, close_mongo_connection
+from backend.services.account_service import account_service
+from backend.services.ai_agents.voice_agent import close_voice_client
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await connect_to_mongo()
+    try:
+        await account_service.initialize_defaults()
+    except Exception as e:
+        # Accounts indexes/seeding are retried on the next accounts request;
+        # the rest of the API shouldn't go down with them
+        logger.error(f"Account defaults/indexes setup failed: {e}")
+    load_page_cache()
     yield
     # Shutdown
+    await close_voice_client()
     await close_mongo_connection()
 
-app = FastAPI(lifespan=lifespan)
+# orjson for every JSON response (much faster than stdlib json)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # ---------------------------------------------------------
 # INCLUDE ROUTERS
@@ -48,6 +68,62 @@ from backend.routers import auth
 app.include_router(auth.router)
 
 
+# ---------------------------------------------------------
+# JSON ETAGS
+# ---------------------------------------------------------
+# Polled JSON GETs (accounts, agent status/alerts, health) rarely change,
+# so repeat polls get an empty 304 instead of the same body again.
+# Registered before CORS so CORS still wraps the 304.
+ETAG_SKIP_PATHS = {"/api/privacy/export"}  # streamed, must not be buffered
+
+
+@app.middleware("http")
+async def json_etag_middleware(request: Request, call_next):
+    response = await call_next(request)
+
+    if (
+        request.method != "GET"
+        or response.status_code != 200
+        or request.url.path in ETAG_SKIP_PATHS
+        or request.scope.get("endpoint") is catch_all
+        or not response.headers.get("content-type", "").startswith("application/json")
+    ):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'"{xxhash.xxh3_64_hexdigest(body)}"'
+    response.headers["ETag"] = etag
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        # Keeps Vary/Cache-Control from the 200 so caches key the 304 the same way
+        return not_modified(response.headers)
+
+    async def replay_body():
+        yield body
+
+    response.body_iterator = replay_body()
+    return response
+
+
+# ---------------------------------------------------------
+# COMPRESSION
+# ---------------------------------------------------------
+# Added after the ETag middleware so ETags are computed on the identity body.
+PRECOMPRESSED_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".woff", ".woff2", ".gz", ".zip", ".pdf")
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZip everything except files that are already compressed."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].lower().endswith(PRECOMPRESSED_SUFFIXES):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # ---------------------------------------------------------
 # CORS Configuration (Allow all for development)
 # ---------------------------------------------------------
@@ -66,12 +142,12 @@ FRONTEND_DIR = Path("frontend")  # Your frontend folder
 
 if FRONTEND_DIR.exists():
     # Serve the whole frontend folder
-    app.mount("/frontend", StaticFiles(directory=str(FRONTEND_DIR)), name="frontend")
+    app.mount("/frontend", CachedStaticFiles(directory=str(FRONTEND_DIR)), name="frontend")
 
     # Serve assets (optional but works for most frontends)
     assets_dir = FRONTEND_DIR / "assets"
     if assets_dir.exists():
-        app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="assets")
+        app.mount("/assets", CachedStaticFiles(directory=str(assets_dir)), name="assets")
         logger.info("Mounted /assets")
     else:
         logger.warning("No /assets folder found in frontend.")
@@ -81,77 +157,140 @@ else:
     # await close_mongo_connection()
 
 
+# ---------------------------------------------------------
+# FRONTEND PAGE CACHE
+# ---------------------------------------------------------
+# HTML pages are immutable for the lifetime of the process, so they are read
+# and hashed once at startup instead of re-opened on every request.
+FRONTEND_PAGES = {
+    "/": "index.html",
+    "/dashboard": "dashboard.html",
+    "/chat": "chat.html",
+    "/parser": "parser.html",
+}
+PAGE_CACHE_MAX_BYTES = 512 * 1024
+PAGE_CACHE_CONTROL = "public, max-age=300"
+
+# route -> (body, etag, media type)
+_page_cache: Dict[str, Tuple[bytes, str, str]] = {}
+# route -> path for pages that exist but are too large to cache
+_page_files: Dict[str, Path] = {}
+
+
+def load_page_cache():
+    """Read every frontend page under the size limit into memory."""
+    _page_cache.clear()
+    _page_files.clear()
+    for route, filename in FRONTEND_PAGES.items():
+        path = FRONTEND_DIR / filename
+        if not path.is_file():
+            continue
+        if path.stat().st_size > PAGE_CACHE_MAX_BYTES:
+            _page_files[route] = path
+            continue
+        body = path.read_bytes()
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        _page_cache[route] = (body, etag, "text/html")
+    logger.info(f"Cached {len(_page_cache)} frontend pages")
+
+
+def serve_page(request: Request, route: str, fallback: dict):
+    """Serve a cached page, answering 304 when the client already has it."""
+    cached = _page_cache.get(route)
+    if cached is not None:
+        body, etag, media_type = cached
+        headers = {"ETag": etag, "Cache-Control": PAGE_CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified(headers)
+        return Response(content=body, media_type=media_type, headers=headers)
+
+    # Too large to cache - stream from disk. Existence was checked at startup.
+    path = _page_files.get(route)
+    if path is not None:
+        return FileResponse(str(path))
+    return fallback
+
+
 # ---------------------------------------------------------
 # FRONTEND ROUTES
 # ---------------------------------------------------------
 @app.get("/")
-async def root_page():
-    index_path = FRONTEND_DIR / "index.html"
-    if index_path.exists():
-        return FileResponse(str(index_path))
-    return {"message": "FinBuddy AI Backend Running"}
+async def root_page(request: Request):
+    return serve_page(request, "/", {"message": "FinBuddy AI Backend Running"})
 
 
 @app.get("/dashboard")
-async def dashboard_page():
-    path = FRONTEND_DIR / "dashboard.html"
-    if path.exists():
-        return FileResponse(str(path))
-    return {"message": "Dashboard not available"}
+async def dashboard_page(request: Request):
+    return serve_page(request, "/dashboard", {"message": "Dashboard not available"})
 
 
 @app.get("/chat")
-async def chat_page():
-    path = FRONTEND_DIR / "chat.html"
-    if path.exists():
-        return FileResponse(str(path))
-    return {"message": "Chat not available"}
+async def chat_page(request: Request):
+    return serve_page(request, "/chat", {"message": "Chat not available"})
 
 
 @app.get("/parser")
-async def parser_page():
-    path = FRONTEND_DIR / "parser.html"
-    if path.exists():
-        return FileResponse(str(path))
-    return {"message": "Parser not available"}
+async def parser_page(request: Request):
+    return serve_page(request, "/parser", {"message": "Parser not available"})
 
 
 # ---------------------------------------------------------
 # HEALTH CHECK
 # ---------------------------------------------------------
+# Static payload - serialized once instead of on every probe
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "version": "2.0",
+    "service": "FinBuddy AI Backend",
+})
+
+
 @app.get("/health")
 async def health_check():
-    return {
-        "status": "healthy",
-        "version": "2.0",
-        "service": "FinBuddy AI Backend",
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 # ---------------------------------------------------------
 # CATCH-ALL (for any unknown frontend route)
 # ---------------------------------------------------------
+STATIC_PREFIXES = ("assets/", "css/", "js/", "static/")
+
+
 @app.get("/{full_path:path}")
-async def catch_all(full_path: str):
+async def catch_all(request: Request, full_path: str):
     # Prevent access to missing static assets
-    if full_path.startswith(("assets/", "css/", "js/", "static/")):
+    if full_path.startswith(STATIC_PREFIXES):
         raise HTTPException(status_code=404, detail="Static file not found")
 
-    index_path = FRONTEND_DIR / "index.html"
-    if index_path.exists():
-        return FileResponse(str(index_path))
-
-    return {"error": "Page not found"}
+    return serve_page(request, "/", {"error": "Page not found"})
 
 
 # ---------------------------------------------------------
 # RUN APP
 # ---------------------------------------------------------
+# Development: single process with auto-reload.
+# Production: one worker per CPU on uvloop + httptools (uvicorn[standard]),
+# ideally behind a reverse proxy that serves large assets with sendfile.
+def run_server():
+    if settings.APP_ENV == "development":
+        uvicorn.run(
+            "backend.app:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info",
+        )
+    else:
+        uvicorn.run(
+            "backend.app:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=(os.cpu_count() or 2),
+            loop="uvloop",
+            http="httptools",
+            log_level="info",
+        )
+
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "backend.app:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info",
-    )
+    run_server()
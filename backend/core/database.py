@@ -3,9 +3,21 @@
 from typing import Optional, Any
 from motor.motor_asyncio import AsyncIOMotorClient
 from motor.core import AgnosticClient
+from pymongo import ASCENDING, DESCENDING, TEXT
 from backend.core.config import settings
 
 
+# Indexes the transaction queries rely on (created at startup)
+TRANSACTION_INDEXES = [
+    [("date", DESCENDING)],
+    [("category", ASCENDING)],
+    [("category_lc", ASCENDING)],
+    [("counterparty_lc", ASCENDING)],
+    [("txn_type", ASCENDING), ("date", DESCENDING)],
+    [("counterparty", TEXT), ("message", TEXT), ("category", TEXT)],
+]
+
+
 class MongoConnection:
     """
     Clean and production-ready MongoDB connection manager.
@@ -42,6 +54,34 @@ class MongoConnection:
             self.database = None
             raise RuntimeError("Cannot connect to MongoDB. Check your MONGO_URI.") from e
 
+        # Connected - index problems don't abort startup: missing indexes make queries
+        # slower, and a missing text index makes search fall back to prefix matching
+        # (see TransactionService.search_transactions)
+        await self.ensure_indexes()
+
+    async def ensure_indexes(self):
+        """
+        Create the indexes the transaction queries rely on (idempotent).
+        Also backfills category_lc / counterparty_lc for documents written before they existed.
+        Each step fails on its own and is logged, so one bad index doesn't skip the rest.
+        """
+        transactions = self.database["transactions"]
+
+        for field in ("category", "counterparty"):
+            try:
+                await transactions.update_many(
+                    {f"{field}_lc": {"$exists": False}, field: {"$type": "string"}},
+                    [{"$set": {f"{field}_lc": {"$toLower": f"${field}"}}}]
+                )
+            except Exception as e:
+                print(f"⚠️ {field}_lc backfill failed: {e}")
+
+        for keys in TRANSACTION_INDEXES:
+            try:
+                await transactions.create_index(keys)
+            except Exception as e:
+                print(f"⚠️ Could not create transactions index {keys}: {e}")
+
     async def disconnect(self):
         """
         Close the connection safely.
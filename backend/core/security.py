@@ -1,43 +1,98 @@
-from cryptography.fernet import Fernet
+from functools import lru_cache
+from typing import List
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 import base64
 import os
 
+from backend.utils.logger import logger
+
 # In a real app, this should be in .env
 # Generating a key for the hackathon demo (consistent across restarts for now)
 # We'll use a hardcoded key for simplicity in this demo environment to avoid data loss on restart if key changes
 # Key must be 32 url-safe base64-encoded bytes
 # This is a valid Fernet key generated for this project
-DEMO_KEY = b'2r5U8q5U8q5U8q5U8q5U8q5U8q5U8q5U8q5U8q5U8q4=' 
+DEMO_KEY = b'2r5U8q5U8q5U8q5U8q5U8q5U8q5U8q5U8q5U8q5U8q4='
+
+# AES-GCM standard nonce size (bytes), prepended to every token
+NONCE_SIZE = 12
+
+
+@lru_cache(maxsize=256)
+def _warn_undecryptable(prefix: str):
+    """Log once per token prefix so unencrypted legacy rows don't flood the log."""
+    logger.warning("Decryption failed for a stored value; returning it unchanged")
+
 
 class SecurityService:
     def __init__(self):
         try:
             self.cipher_suite = Fernet(DEMO_KEY)
+            master_key = base64.urlsafe_b64decode(DEMO_KEY)
         except Exception as e:
             # Fallback or generate new if invalid (shouldn't happen with hardcoded valid key)
             key = Fernet.generate_key()
             self.cipher_suite = Fernet(key)
+            master_key = base64.urlsafe_b64decode(key)
 
-    def encrypt_data(self, data: str) -> str:
-        """Encrypts a string and returns a url-safe base64 encoded string."""
-        if not data:
-            return ""
-        try:
-            encrypted_bytes = self.cipher_suite.encrypt(data.encode('utf-8'))
-            return encrypted_bytes.decode('utf-8')
-        except Exception as e:
-            print(f"Encryption error: {e}")
-            return data
+        # New data uses AES-GCM (hardware AES-NI); Fernet stays only to read older tokens.
+        # Derive a separate key so the Fernet key is not reused for another cipher.
+        aes_key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b"finbuddy-aesgcm",
+        ).derive(master_key)
+        self.aes = AESGCM(aes_key)
 
-    def decrypt_data(self, token: str) -> str:
-        """Decrypts a token and returns the original string."""
-        if not token:
-            return ""
+    def encrypt_many(self, items: List[str]) -> List[str]:
+        """Encrypts a batch of strings; each gets its own random nonce."""
+        aes = self.aes
+        results = []
+        for data in items:
+            if not data:
+                results.append("")
+                continue
+            nonce = os.urandom(NONCE_SIZE)
+            ciphertext = aes.encrypt(nonce, data.encode('utf-8'), None)
+            results.append(base64.urlsafe_b64encode(nonce + ciphertext).decode('ascii'))
+        return results
+
+    def decrypt_many(self, tokens: List[str]) -> List[str]:
+        """Decrypts a batch of tokens produced by encrypt_many (or legacy Fernet)."""
+        aes = self.aes
+        results = []
+        for token in tokens:
+            if not token:
+                results.append("")
+                continue
+            try:
+                raw = base64.urlsafe_b64decode(token)
+                plaintext = aes.decrypt(raw[:NONCE_SIZE], raw[NONCE_SIZE:], None)
+                results.append(plaintext.decode('utf-8'))
+            except (InvalidTag, ValueError):
+                # Not an AES-GCM token (bad base64 / tag) - try the legacy format
+                results.append(self._decrypt_legacy(token))
+        return results
+
+    def _decrypt_legacy(self, token: str) -> str:
         try:
             decrypted_bytes = self.cipher_suite.decrypt(token.encode('utf-8'))
             return decrypted_bytes.decode('utf-8')
-        except Exception as e:
+        except InvalidToken:
             # If decryption fails (e.g., old unencrypted data), return original
+            _warn_undecryptable(token[:8])
             return token
 
+    def encrypt_data(self, data: str) -> str:
+        """Encrypts a string and returns a url-safe base64 encoded string."""
+        return self.encrypt_many([data])[0]
+
+    def decrypt_data(self, token: str) -> str:
+        """Decrypts a token and returns the original string."""
+        return self.decrypt_many([token])[0]
+
 security_service = SecurityService()
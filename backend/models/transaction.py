@@ -68,9 +68,9 @@ class Transaction(TransactionBase):
     def from_mongo(cls, data: dict) -> "Transaction":
         """Convert MongoDB document to Transaction model"""
         if data.get("_id"):
-            data["id"] = str(data["_id"])
-            del data["_id"]
-        return cls(**data)
+            data["id"] = str(data.pop("_id"))
+        # model_validate takes the dict as-is (no kwargs re-packing)
+        return cls.model_validate(data)
 
 
 # ----------------------------------------------------------
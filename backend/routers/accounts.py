@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException
-from backend.services.account_service import AccountService
+from backend.services.account_service import account_service
 
 router = APIRouter(prefix="/api/accounts", tags=["Accounts"])
 
@@ -7,12 +7,10 @@ router = APIRouter(prefix="/api/accounts", tags=["Accounts"])
 async def get_accounts():
     """
     Get all user accounts with current balances.
-    Initializes defaults if no accounts exist.
+    Defaults are seeded once at startup.
     """
     try:
-        service = AccountService()
-        await service.initialize_defaults()
-        accounts = await service.get_all_accounts()
+        accounts = await account_service.get_all_accounts()
         return accounts
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch accounts: {str(e)}")
@@ -5,6 +5,7 @@ Endpoints for managing and monitoring autonomous AI agents
 
 from fastapi import APIRouter, HTTPException
 from typing import List, Dict, Any
+import asyncio
 import logging
 
 from backend.services.autonomous_scheduler import autonomous_scheduler
@@ -90,6 +91,21 @@ async def get_notifications(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/notifications/read")
+async def mark_notifications_read(notification_ids: List[str]):
+    """Mark several notifications as read at once ("mark all seen")"""
+    try:
+        marked = notification_engine.mark_many_as_read(notification_ids)
+        return {
+            "success": True,
+            "marked": marked,
+            "message": "Notifications marked as read"
+        }
+    except Exception as e:
+        logger.error(f"Error marking notifications as read: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/notifications/{notification_id}/read")
 async def mark_notification_read(notification_id: str):
     """Mark notification as read"""
@@ -138,7 +154,8 @@ async def clear_all_notifications(user_id: str = "default_user"):
 async def trigger_hourly_check():
     """Manually trigger hourly checks (for demo purposes)"""
     try:
-        autonomous_scheduler.run_hourly_checks()
+        # Synchronous agent work - run in a thread so the event loop stays free
+        await asyncio.get_running_loop().run_in_executor(None, autonomous_scheduler.run_hourly_checks)
         return {
             "success": True,
             "message": "Hourly checks triggered",
@@ -153,7 +170,7 @@ async def trigger_hourly_check():
 async def trigger_deep_analysis():
     """Manually trigger deep analysis (for demo purposes)"""
     try:
-        autonomous_scheduler.run_deep_analysis()
+        await asyncio.get_running_loop().run_in_executor(None, autonomous_scheduler.run_deep_analysis)
         return {
             "success": True,
             "message": "Deep analysis triggered",
@@ -197,94 +214,80 @@ async def stop_scheduler():
 
 # ==================== DEMO SCENARIOS ====================
 
-@router.post("/demo/budget-alert")
-async def demo_budget_alert(user_id: str = "default_user"):
-    """
-    Demo: Trigger a budget overspend alert
-    Shows proactive intervention
-    """
-    try:
-        notification = notification_engine.send_notification(
-            user_id=user_id,
-            title="🚨 Budget Alert: Food Category",
-            message="You've spent ₹8,500 of ₹10,000 food budget (85%). At this pace, you'll exceed by ₹2,300. Suggested action: Limit dining out to ₹500 for next 10 days.",
-            urgency=NotificationUrgency.HIGH,
-            agent_name="budget_guardian",
-            action_buttons=[
+# One template per demo; served by a single parametric route
+DEMO_SCENARIOS: Dict[str, Dict[str, Any]] = {
+    # Budget overspend alert - shows proactive intervention
+    "budget-alert": {
+        "description": "Budget alert demo triggered",
+        "notification": {
+            "title": "🚨 Budget Alert: Food Category",
+            "message": "You've spent ₹8,500 of ₹10,000 food budget (85%). At this pace, you'll exceed by ₹2,300. Suggested action: Limit dining out to ₹500 for next 10 days.",
+            "urgency": NotificationUrgency.HIGH,
+            "agent_name": "budget_guardian",
+            "action_buttons": [
                 {"label": "Accept Suggestion", "action": "accept_budget_plan"},
                 {"label": "Adjust Budget", "action": "adjust_budget"},
                 {"label": "Ignore", "action": "dismiss"}
             ],
-            data={"category": "Food", "current": 8500, "budget": 10000, "percentage": 85}
-        )
-        
-        return {
-            "success": True,
-            "message": "Budget alert demo triggered",
-            "notification": notification.to_dict()
+            "data": {"category": "Food", "current": 8500, "budget": 10000, "percentage": 85}
         }
-    except Exception as e:
-        logger.error(f"Error in budget alert demo: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.post("/demo/gst-warning")
-async def demo_gst_warning(user_id: str = "default_user"):
-    """
-    Demo: Trigger GST compliance warning
-    Shows proactive compliance monitoring
-    """
-    try:
-        notification = notification_engine.send_notification(
-            user_id=user_id,
-            title="⚠️ GST Compliance Warning",
-            message="Your yearly income is ₹18,50,000 (92.5% of ₹20,00,000 threshold). Only ₹1,50,000 away from mandatory GST registration. Prepare documents now.",
-            urgency=NotificationUrgency.CRITICAL,
-            agent_name="compliance_monitor",
-            action_buttons=[
+    },
+    # GST compliance warning - shows proactive compliance monitoring
+    "gst-warning": {
+        "description": "GST warning demo triggered",
+        "notification": {
+            "title": "⚠️ GST Compliance Warning",
+            "message": "Your yearly income is ₹18,50,000 (92.5% of ₹20,00,000 threshold). Only ₹1,50,000 away from mandatory GST registration. Prepare documents now.",
+            "urgency": NotificationUrgency.CRITICAL,
+            "agent_name": "compliance_monitor",
+            "action_buttons": [
                 {"label": "View Details", "action": "view_gst_details"},
                 {"label": "Set Reminder", "action": "set_reminder"},
                 {"label": "Talk to AI", "action": "open_chat"}
             ],
-            data={"current_income": 1850000, "threshold": 2000000, "percentage": 92.5}
-        )
-        
-        return {
-            "success": True,
-            "message": "GST warning demo triggered",
-            "notification": notification.to_dict()
+            "data": {"current_income": 1850000, "threshold": 2000000, "percentage": 92.5}
         }
-    except Exception as e:
-        logger.error(f"Error in GST warning demo: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    },
+    # Savings opportunity detection - shows autonomous optimization
+    "savings-opportunity": {
+        "description": "Savings opportunity demo triggered",
+        "notification": {
+            "title": "💡 Savings Opportunity Detected",
+            "message": "I detected ₹5,000 surplus this month! Smart allocation: ₹3,000 → Emergency Fund (60% of goal), ₹2,000 → ELSS (tax saving + growth).",
+            "urgency": NotificationUrgency.MEDIUM,
+            "agent_name": "savings_optimizer",
+            "action_buttons": [
+                {"label": "Auto-Save", "action": "auto_save"},
+                {"label": "Customize", "action": "customize_savings"},
+                {"label": "Skip This Month", "action": "skip"}
+            ],
+            "data": {"surplus": 5000, "emergency_allocation": 3000, "investment_allocation": 2000}
+        }
+    },
+}
 
 
-@router.post("/demo/savings-opportunity")
-async def demo_savings_opportunity(user_id: str = "default_user"):
+@router.post("/demo/{scenario}")
+async def trigger_demo_scenario(scenario: str, user_id: str = "default_user"):
     """
-    Demo: Trigger savings opportunity detection
-    Shows autonomous optimization
+    Demo: Trigger a canned proactive notification
+    Scenarios: budget-alert, gst-warning, savings-opportunity
     """
+    demo = DEMO_SCENARIOS.get(scenario)
+    if demo is None:
+        raise HTTPException(status_code=404, detail=f"Unknown demo scenario: {scenario}")
+
     try:
-        notification = notification_engine.send_notification(
+        notification = await notification_engine.send_notification(
             user_id=user_id,
-            title="💡 Savings Opportunity Detected",
-            message="I detected ₹5,000 surplus this month! Smart allocation: ₹3,000 → Emergency Fund (60% of goal), ₹2,000 → ELSS (tax saving + growth).",
-            urgency=NotificationUrgency.MEDIUM,
-            agent_name="savings_optimizer",
-            action_buttons=[
-                {"label": "Auto-Save", "action": "auto_save"},
-                {"label": "Customize", "action": "customize_savings"},
-                {"label": "Skip This Month", "action": "skip"}
-            ],
-            data={"surplus": 5000, "emergency_allocation": 3000, "investment_allocation": 2000}
+            **demo["notification"]
         )
         
         return {
             "success": True,
-            "message": "Savings opportunity demo triggered",
+            "message": demo["description"],
             "notification": notification.to_dict()
         }
     except Exception as e:
-        logger.error(f"Error in savings opportunity demo: {str(e)}")
+        logger.error(f"Error in {scenario} demo: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
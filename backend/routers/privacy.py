@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException, Response
-from backend.services.transaction_service import TransactionService
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from backend.services.transaction_service import get_transaction_service
 from backend.core.database import mongo
-import json
+import orjson
 from datetime import datetime
 
 router = APIRouter(prefix="/api/privacy", tags=["Privacy"])
@@ -10,30 +11,33 @@ router = APIRouter(prefix="/api/privacy", tags=["Privacy"])
 async def export_data():
     """
     Export all user data as a JSON file.
+    Streamed straight from the Mongo cursor so memory stays constant.
     """
     try:
-        service = TransactionService()
-        transactions = await service.get_all_transactions()
-        
-        # Convert transactions to list of dicts
-        data = [tx.dict() for tx in transactions]
-        
-        # Create a JSON string
-        json_data = json.dumps({
-            "export_date": datetime.now().isoformat(),
-            "record_count": len(data),
-            "transactions": data
-        }, default=str, indent=4)
-        
-        # Return as a downloadable file
-        return Response(
-            content=json_data,
-            media_type="application/json",
-            headers={"Content-Disposition": "attachment; filename=finbuddy_data_export.json"}
-        )
+        service = get_transaction_service()
+        cursor = service.get_transactions_cursor()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
+    async def generate():
+        export_date = orjson.dumps(datetime.now().isoformat())
+        yield b'{"export_date":' + export_date + b',"transactions":['
+
+        count = 0
+        async for doc in cursor:
+            doc["id"] = str(doc.pop("_id"))
+            yield (b"," if count else b"") + orjson.dumps(doc, default=str)
+            count += 1
+
+        yield b'],"record_count":' + str(count).encode() + b"}"
+
+    # Return as a downloadable file
+    return StreamingResponse(
+        generate(),
+        media_type="application/json",
+        headers={"Content-Disposition": "attachment; filename=finbuddy_data_export.json"}
+    )
+
 @router.delete("/account")
 async def delete_account():
     """
@@ -1,11 +1,12 @@
 # backend/routers/transactions.py
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import Optional
 import uuid
 
-from backend.services.transaction_service import TransactionService
+from backend.services.transaction_service import get_transaction_service
 from backend.services.ai_orchestrator import AIOrchestrator
 from backend.parsers.sms_parser import parse_sms
 from backend.parsers.voice_parser import parse_voice_command
@@ -20,10 +21,8 @@ router = APIRouter(prefix="/api/transactions", tags=["Transactions"])
 
 # ---------------------------------------------------------
 # HELPERS TO AVOID GLOBAL INSTANCES
+# (transaction service is a lazily-built shared instance)
 # ---------------------------------------------------------
-def get_transaction_service():
-    return TransactionService()
-
 def get_orchestrator():
     return AIOrchestrator()
 
@@ -198,10 +197,8 @@ async def create_transactions_from_pdf(payload: PDFText):
     result = parse_pdf_statement(payload.ocr_text)
     txns = result.get("transactions", [])
 
-    saved = []
-
-    for t in txns:
-        base = {
+    docs = [
+        {
             "date": datetime.now(),
             "txn_type": t.get("txn_type", "Unknown"),
             "amount": t.get("amount"),
@@ -211,9 +208,11 @@ async def create_transactions_from_pdf(payload: PDFText):
             "ai_insight": None,
             "compliance_alert": None
         }
+        for t in txns
+    ]
 
-        saved_txn = await get_transaction_service().create_transaction(base)
-        saved.append(saved_txn.dict())
+    saved_txns = await get_transaction_service().create_transactions_bulk(docs)
+    saved = [t.dict() for t in saved_txns]
 
     return {"total": len(saved), "saved": saved}
 
@@ -222,8 +221,8 @@ async def create_transactions_from_pdf(payload: PDFText):
 # 6️⃣ GET ALL TXNS
 # =========================================================
 @router.get("/")
-async def get_transactions():
-    txns = await get_transaction_service().get_all_transactions()
+async def get_transactions(skip: int = Query(0, ge=0), limit: Optional[int] = Query(None, ge=1)):
+    txns = await get_transaction_service().get_all_transactions(skip=skip, limit=limit)
     return {"transactions": [t.dict() for t in txns]}
 
 
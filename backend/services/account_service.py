@@ -1,58 +1,131 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from backend.core.database import mongo
+from backend.utils.logger import logger
 from datetime import datetime
 
+ACCOUNT_PROJECTION = {
+    "_id": 0,
+    "id": {"$toString": "$_id"},
+    "name": 1,
+    "type": 1,
+    "balance": 1,
+    "icon": 1,
+    "color": 1,
+}
+
+DEFAULT_ACCOUNTS = [
+    {
+        "name": "HDFC Bank",
+        "name_lc": "hdfc bank",
+        "type": "bank",
+        "balance": 25000.0,
+        "icon": "fa-university",
+        "color": "primary"
+    },
+    {
+        "name": "Paytm Wallet",
+        "name_lc": "paytm wallet",
+        "type": "wallet",
+        "balance": 1500.0,
+        "icon": "fa-wallet",
+        "color": "info"
+    },
+    {
+        "name": "Cash",
+        "name_lc": "cash",
+        "type": "cash",
+        "balance": 5000.0,
+        "icon": "fa-money-bill-wave",
+        "color": "success"
+    }
+]
+
+# MongoDB duplicate key error code (E11000)
+DUPLICATE_KEY_ERROR = 11000
+
 class AccountService:
+    # Shared across instances: index + default seeding only need to succeed once per process
+    _indexes_ready = False
+
     def __init__(self):
         self.db = None
+        self.collection = None
 
     async def _get_collection(self):
-        if self.db is None:
+        if self.collection is None:
             self.db = mongo.get_db()
-        return self.db.accounts
+            self.collection = self.db.accounts
+        if not AccountService._indexes_ready:
+            # Retried on every call until it succeeds, so a failed startup recovers here
+            await self._ensure_indexes(self.collection)
+            await self._seed_defaults(self.collection)
+            AccountService._indexes_ready = True
+        return self.collection
+
+    async def _ensure_indexes(self, collection):
+        """Backfill the normalized name and index it for exact lookups."""
+        await collection.update_many(
+            {"name_lc": {"$exists": False}},
+            [{"$set": {"name_lc": {"$toLower": "$name"}}}]
+        )
+        await self._dedupe_names(collection)
+        await collection.create_index("name_lc", unique=True)
+
+    async def _dedupe_names(self, collection):
+        """
+        Older databases can hold names that differ only by case (e.g. defaults
+        seeded twice before the unique index existed). The oldest account keeps
+        the name - it is the one lookups already resolved to - and the others
+        get a suffixed name_lc so the unique index can be built without deleting data.
+        """
+        duplicates = await collection.aggregate([
+            {"$sort": {"_id": 1}},
+            {"$group": {"_id": "$name_lc", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}}
+        ]).to_list(None)
+        if not duplicates:
+            return
+
+        ops = [
+            UpdateOne({"_id": _id}, {"$set": {"name_lc": f"{group['_id']}#{_id}"}})
+            for group in duplicates
+            for _id in group["ids"][1:]
+        ]
+        await collection.bulk_write(ops, ordered=False)
+        logger.warning(f"Renamed {len(ops)} duplicate account name(s) before indexing name_lc")
 
     async def initialize_defaults(self):
-        """Initialize default accounts if none exist."""
-        collection = await self._get_collection()
-        count = await collection.count_documents({})
-        
-        if count == 0:
-            defaults = [
-                {
-                    "name": "HDFC Bank",
-                    "type": "bank",
-                    "balance": 25000.0,
-                    "icon": "fa-university",
-                    "color": "primary"
-                },
-                {
-                    "name": "Paytm Wallet",
-                    "type": "wallet",
-                    "balance": 1500.0,
-                    "icon": "fa-wallet",
-                    "color": "info"
-                },
-                {
-                    "name": "Cash",
-                    "type": "cash",
-                    "balance": 5000.0,
-                    "icon": "fa-money-bill-wave",
-                    "color": "success"
-                }
-            ]
-            await collection.insert_many(defaults)
-            return True
-        return False
+        """
+        Ensure the name_lc index and seed the default accounts.
+        Called once at startup (see app lifespan), not per request; if it
+        fails there, the next accounts request retries it via _get_collection.
+        """
+        await self._get_collection()
+
+    async def _seed_defaults(self, collection) -> bool:
+        """
+        Insert the default accounts. Idempotent: the unique name_lc index
+        rejects defaults that already exist, so no count query is needed and
+        concurrent workers can't double-seed.
+        """
+        try:
+            # insert_many adds _id to the dicts, so hand it copies
+            await collection.insert_many([dict(d) for d in DEFAULT_ACCOUNTS], ordered=False)
+            inserted = True
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(err.get("code") != DUPLICATE_KEY_ERROR for err in errors):
+                raise
+            inserted = e.details.get("nInserted", 0) > 0
+
+        return inserted
 
     async def get_all_accounts(self) -> List[Dict[str, Any]]:
         collection = await self._get_collection()
-        cursor = collection.find({})
-        accounts = []
-        async for doc in cursor:
-            doc["id"] = str(doc["_id"])
-            del doc["_id"]
-            accounts.append(doc)
-        return accounts
+        # _id -> id rename happens server-side (projection expressions, MongoDB 4.4+)
+        return await collection.find({}, projection=ACCOUNT_PROJECTION).to_list(length=100)
 
     async def update_balance(self, account_name: str, amount: float, is_credit: bool = False):
         """
@@ -61,27 +134,64 @@ class AccountService:
         is_credit: True if money coming IN, False if money going OUT
         """
         collection = await self._get_collection()
-        
-        # Find account (case-insensitive)
-        account = await collection.find_one({"name": {"$regex": f"^{account_name}$", "$options": "i"}})
-        
+        change = amount if is_credit else -amount
+
+        # Atomic increment on the indexed normalized name
+        account = await collection.find_one_and_update(
+            {"name_lc": account_name.lower()},
+            {"$inc": {"balance": change}}
+        )
+
         if not account:
             # If account doesn't exist, maybe create it or default to Cash?
             # For now, let's default to 'Cash' if not found, or just return False
             if account_name.lower() == "cash":
                 # Should exist from defaults, but just in case
                 return False
-            
+
             # Try falling back to Cash
-            account = await collection.find_one({"name": "Cash"})
+            account = await collection.find_one_and_update(
+                {"name_lc": "cash"},
+                {"$inc": {"balance": change}}
+            )
             if not account:
                 return False
 
-        change = amount if is_credit else -amount
-        new_balance = account["balance"] + change
-        
-        await collection.update_one(
-            {"_id": account["_id"]},
-            {"$set": {"balance": new_balance}}
-        )
         return True
+
+    async def bulk_update_balances(self, updates: List[Tuple[str, float, bool]]) -> int:
+        """
+        Apply many balance updates in a single bulk write (imports, PDF statements).
+        updates: (account_name, amount, is_credit) tuples
+        Unknown accounts fall back to Cash, same as update_balance.
+        Returns the number of accounts modified.
+        """
+        if not updates:
+            return 0
+
+        collection = await self._get_collection()
+        known = set(await collection.distinct("name_lc"))
+
+        # Net change per account -> one $inc per account
+        changes: Dict[str, float] = {}
+        for account_name, amount, is_credit in updates:
+            name_lc = account_name.lower()
+            if name_lc not in known:
+                if "cash" not in known:
+                    continue
+                name_lc = "cash"
+            changes[name_lc] = changes.get(name_lc, 0.0) + (amount if is_credit else -amount)
+
+        if not changes:
+            return 0
+
+        ops = [
+            UpdateOne({"name_lc": name_lc}, {"$inc": {"balance": change}})
+            for name_lc, change in changes.items()
+        ]
+        result = await collection.bulk_write(ops, ordered=False)
+        return result.modified_count
+
+
+# Global account service instance
+account_service = AccountService()
@@ -1,14 +1,38 @@
 import base64
-import tempfile
 import os
-from groq import AsyncGroq
 import logging
-import tempfile
-import base64
+from typing import Optional
+
+import httpx
 from openai import AsyncOpenAI
 
 logger = logging.getLogger("FinBuddy")
 
+# ======================================================================
+# SHARED CLIENT
+# One keep-alive pool for every VoiceAgent (a new agent is built per
+# request), so warm requests skip the TCP/TLS handshake.
+# ======================================================================
+_http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30),
+    http2=True,
+    timeout=30,
+)
+_openai_client: Optional[AsyncOpenAI] = None
+
+
+def _get_openai_client(api_key: str) -> AsyncOpenAI:
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(api_key=api_key, http_client=_http_client)
+    return _openai_client
+
+
+async def close_voice_client():
+    """Close the shared HTTP pool (called on app shutdown)."""
+    await _http_client.aclose()
+
+
 class VoiceAgent:
     def __init__(self):
         self.openai_key = os.getenv("OPENAI_API_KEY")
@@ -16,7 +40,7 @@ class VoiceAgent:
 
         if self.openai_key:
             try:
-                self.client = AsyncOpenAI(api_key=self.openai_key)
+                self.client = _get_openai_client(self.openai_key)
                 logger.info("⚡ OpenAI API key loaded — Whisper active")
             except Exception as e:
                 logger.error(f"❌ Failed to init OpenAI client: {e}")
@@ -28,8 +52,6 @@ class VoiceAgent:
     # MAIN SPEECH-TO-TEXT FUNCTION
     # ====================================================================
     async def speech_to_text(self, audio_data_base64: str, mime_type: str = "audio/webm") -> str:
-        audio_path = None
-
         try:
             # --------------------------------------------------------------
             # 1. Decode Base64
@@ -41,9 +63,9 @@ class VoiceAgent:
                 return "Voice input unavailable"
 
             # --------------------------------------------------------------
-            # 2. Write temp file (Browser usually sends WebM)
+            # 2. Pick a filename (Browser usually sends WebM)
             # --------------------------------------------------------------
-            # Determine extension
+            # Whisper detects the format from the extension
             ext = ".webm"
             if "mp4" in mime_type:
                 ext = ".mp4"
@@ -52,12 +74,8 @@ class VoiceAgent:
             elif "wav" in mime_type:
                 ext = ".wav"
 
-            with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as temp:
-                temp.write(audio_bytes)
-                audio_path = temp.name
-            
             file_size = len(audio_bytes)
-            logger.info(f"🎧 Temp audio saved: {audio_path} (Size: {file_size} bytes)")
+            logger.info(f"🎧 Audio decoded (Size: {file_size} bytes)")
             
             if file_size < 1000:
                 logger.warning("⚠️ Audio file is very small! Microphone might be muted or blocked.")
@@ -68,13 +86,13 @@ class VoiceAgent:
             if self.client:
                 logger.info("🎙️ Sending audio to OpenAI Whisper...")
                 try:
-                    with open(audio_path, "rb") as f:
-                        result = await self.client.audio.transcriptions.create(
-                            file=f,
-                            model="whisper-1",
-                            response_format="json"
-                        )
-                    
+                    # Bytes go straight to the SDK - no temp file round-trip
+                    result = await self.client.audio.transcriptions.create(
+                        file=(f"audio{ext}", audio_bytes, mime_type),
+                        model="whisper-1",
+                        response_format="json"
+                    )
+
                     text = result.text.strip() if hasattr(result, "text") else ""
                     logger.info(f"🗣 Whisper → {text}")
                     return text
@@ -96,14 +114,6 @@ class VoiceAgent:
             logger.error(f"❌ Voice STT pipeline crashed: {e}")
             return "Voice input unavailable"
 
-        finally:
-            # Cleanup WAV
-            try:
-                if audio_path and os.path.exists(audio_path):
-                    os.remove(audio_path)
-            except:
-                pass
-
     # ====================================================================
     # FALLBACK (ONLY IF WHISPER UNAVAILABLE)
     # ====================================================================
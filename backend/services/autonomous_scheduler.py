@@ -16,6 +16,9 @@ from backend.ml.budget_predictor import BudgetPredictor
 
 logger = logging.getLogger(__name__)
 
+# Seconds a materialized get_all_alerts() result is reused (dashboard polling)
+ALERTS_CACHE_TTL = 2.0
+
 
 class AutonomousScheduler:
     """
@@ -30,6 +33,8 @@ class AutonomousScheduler:
         self.budget_predictor = BudgetPredictor()
         self.is_running = False
         self.thread = None
+        self._alerts_cache: List[Dict] = []
+        self._alerts_cached_at = 0.0
         
         # Agent states
         self.agent_states = {
@@ -102,6 +107,8 @@ class AutonomousScheduler:
             logger.info("✅ Hourly checks complete")
         except Exception as e:
             logger.error(f"Error in hourly checks: {str(e)}")
+
+        self.invalidate_alerts_cache()
     
     # ==================== DEEP ANALYSIS ====================
     
@@ -125,6 +132,8 @@ class AutonomousScheduler:
             logger.info("✅ Deep analysis complete")
         except Exception as e:
             logger.error(f"Error in deep analysis: {str(e)}")
+
+        self.invalidate_alerts_cache()
     
     # ==================== AGENT 1: BUDGET GUARDIAN ====================
     
@@ -519,8 +528,16 @@ class AutonomousScheduler:
             "total_alerts": sum(len(agent["alerts"]) for agent in self.agent_states.values())
         }
     
+    def invalidate_alerts_cache(self):
+        """Force the next get_all_alerts() call to rebuild the list"""
+        self._alerts_cached_at = 0.0
+
     def get_all_alerts(self) -> List[Dict]:
-        """Get all current alerts from all agents"""
+        """Get all current alerts from all agents (cached for ALERTS_CACHE_TTL seconds)"""
+        now = time.monotonic()
+        if now - self._alerts_cached_at < ALERTS_CACHE_TTL:
+            return self._alerts_cache
+
         all_alerts = []
         for agent_name, agent_state in self.agent_states.items():
             for alert in agent_state["alerts"]:
@@ -530,7 +547,9 @@ class AutonomousScheduler:
         # Sort by urgency
         urgency_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
         all_alerts.sort(key=lambda x: urgency_order.get(x.get("urgency", "low"), 3))
-        
+
+        self._alerts_cache = all_alerts
+        self._alerts_cached_at = now
         return all_alerts
 
 
@@ -1,7 +1,7 @@
 # backend/services/compliance_service.py
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 from backend.core.config import settings
 from backend.core.database import get_transactions_collection
 from backend.models.transaction import TransactionType
@@ -30,22 +30,28 @@ class ComplianceService:
         except Exception:
             return datetime.utcnow()
 
+    def transaction_year(self, tx: dict) -> int:
+        """Year a transaction counts towards for GST (YTD) purposes."""
+        return self._ensure_datetime(tx.get("date")).year
+
     # --------------------------------------------------------
     # YTD INCOME (from MongoDB)
     # --------------------------------------------------------
     async def get_ytd_income(self, year: int) -> float:
         """Calculate Year-To-Date credited income directly from MongoDB."""
-        cursor = self.collection.find({
-            "txn_type": TransactionType.CREDITED.value,
-            "date": {
-                "$gte": datetime(year, 1, 1),
-                "$lte": datetime(year, 12, 31)
-            }
-        })
-
-        docs = await cursor.to_list(None)
-        total = sum(tx.get("amount", 0) for tx in docs)
-        return total
+        # Half-open [Jan 1, next Jan 1) window, computed once; Mongo does the sum
+        results = await self.collection.aggregate([
+            {"$match": {
+                "txn_type": TransactionType.CREDITED.value,
+                "date": {
+                    "$gte": datetime(year, 1, 1),
+                    "$lt": datetime(year + 1, 1, 1)
+                }
+            }},
+            {"$group": {"_id": None, "total": {"$sum": "$amount"}}}
+        ]).to_list(1)
+
+        return results[0]["total"] if results else 0
 
     # --------------------------------------------------------
     # GST COMPLIANCE CHECK
@@ -76,8 +82,12 @@ class ComplianceService:
     # --------------------------------------------------------
     # MAIN TRANSACTION ANALYZER
     # --------------------------------------------------------
-    async def analyze_transaction(self, tx: dict) -> dict:
-        """Generate insights + GST compliance alerts for a transaction."""
+    async def analyze_transaction(self, tx: dict, gst_by_year: Optional[Dict[int, Optional[str]]] = None) -> dict:
+        """
+        Generate insights + GST compliance alerts for a transaction.
+        gst_by_year: precomputed check_gst_compliance results (batch imports),
+        so a batch runs the YTD aggregation once per year instead of per row.
+        """
         try:
             amount = tx.get("amount", 0)
             txn_type = tx.get("txn_type", TransactionType.UNKNOWN.value)
@@ -104,10 +114,12 @@ class ComplianceService:
             # ------------------------------------------------
             # GST CHECK
             # ------------------------------------------------
-            tx_date = self._ensure_datetime(tx.get("date"))
-            year = tx_date.year
+            year = self.transaction_year(tx)
 
-            gst_msg = await self.check_gst_compliance(year)
+            if gst_by_year is not None and year in gst_by_year:
+                gst_msg = gst_by_year[year]
+            else:
+                gst_msg = await self.check_gst_compliance(year)
             if gst_msg:
                 alerts.append(gst_msg)
 
@@ -3,7 +3,7 @@
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from backend.ml.score_engine import AdvancedFinancialHealthScorer
-from backend.services.transaction_service import TransactionService
+from backend.services.transaction_service import get_transaction_service
 from backend.utils.logger import logger
 
 
@@ -15,7 +15,7 @@ class HealthScoreService:
     
     def __init__(self):
         self.scorer = AdvancedFinancialHealthScorer()
-        self.transaction_service = TransactionService()
+        self.transaction_service = get_transaction_service()
         logger.info("HealthScoreService initialized")
     
     def get_default_budgets(self) -> Dict[str, float]:
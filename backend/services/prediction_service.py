@@ -3,7 +3,7 @@
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from backend.ml.budget_predictor import BudgetPredictor
-from backend.services.transaction_service import TransactionService
+from backend.services.transaction_service import get_transaction_service
 from backend.utils.logger import logger
 
 
@@ -45,7 +45,7 @@ class PredictionService:
     
     def __init__(self):
         self.predictor = BudgetPredictor()
-        self.transaction_service = TransactionService()
+        self.transaction_service = get_transaction_service()
         logger.info("PredictionService initialized")
     
     def get_historical_transactions(self, days: int = 60) -> List[dict]:
@@ -3,13 +3,27 @@ Proactive Notification Engine - Multi-channel notification system for Agentic AI
 Sends intelligent, context-aware notifications to users
 """
 
+import asyncio
+import heapq
 import logging
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import time
+import uuid
+from collections import defaultdict, deque
+from operator import attrgetter
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timezone
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Per-user send history is only used for the 1-hour frequency check
+HISTORY_WINDOW_SECONDS = 3600
+HISTORY_MAXLEN = 100
+
+# Identical notifications (same user/title/message/agent) within this window are dropped
+DEDUP_WINDOW_SECONDS = 300
+DEDUP_PURGE_THRESHOLD = 1000  # purge expired entries once the table reaches this size
+
 
 class NotificationUrgency(Enum):
     """Notification urgency levels"""
@@ -19,6 +33,15 @@ class NotificationUrgency(Enum):
     LOW = "low"            # Green - Celebration/info
 
 
+# Sort rank per urgency (lower = shown first)
+URGENCY_RANK = {
+    NotificationUrgency.CRITICAL: 0,
+    NotificationUrgency.HIGH: 1,
+    NotificationUrgency.MEDIUM: 2,
+    NotificationUrgency.LOW: 3
+}
+
+
 class NotificationChannel(Enum):
     """Available notification channels"""
     PUSH = "push"          # Push notification
@@ -27,6 +50,15 @@ class NotificationChannel(Enum):
     SMS = "sms"            # SMS alert (critical only)
 
 
+# Delivery channels per urgency (immutable, shared - no per-send allocation)
+_URGENCY_CHANNELS = {
+    NotificationUrgency.CRITICAL: (NotificationChannel.PUSH, NotificationChannel.IN_APP, NotificationChannel.EMAIL),
+    NotificationUrgency.HIGH: (NotificationChannel.PUSH, NotificationChannel.IN_APP),
+    NotificationUrgency.MEDIUM: (NotificationChannel.IN_APP,),
+    NotificationUrgency.LOW: (NotificationChannel.IN_APP,),
+}
+
+
 class ProactiveNotification:
     """Represents a proactive notification"""
     
@@ -39,16 +71,19 @@ class ProactiveNotification:
         action_buttons: Optional[List[Dict]] = None,
         data: Optional[Dict] = None
     ):
-        self.id = f"notif_{datetime.now().timestamp()}"
+        now = datetime.now(timezone.utc)
+        self.id = f"notif_{uuid.uuid4().hex}"  # collision-free, unlike a timestamp
         self.title = title
         self.message = message
         self.urgency = urgency
         self.agent_name = agent_name
         self.action_buttons = action_buttons or []
         self.data = data or {}
-        self.created_at = datetime.now()
+        self.created_at = now
         self.read = False
         self.dismissed = False
+        # Precomputed sort key: most urgent first, then newest
+        self._sort_key = (URGENCY_RANK[urgency], -self.created_at.timestamp())
     
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
@@ -73,15 +108,28 @@ class ProactiveNotificationEngine:
     """
     
     def __init__(self):
-        self.notifications = []  # In-memory store (use DB in production)
+        # In-memory store (use DB in production)
+        self.by_user: Dict[str, List[ProactiveNotification]] = defaultdict(list)
+        self.by_id: Dict[str, ProactiveNotification] = {}
         self.user_preferences = {}  # User notification preferences
-        self.notification_history = []  # Track sent notifications
+        # Send timestamps per user (bounded, oldest on the left)
+        self.history_by_user: Dict[str, deque] = defaultdict(lambda: deque(maxlen=HISTORY_MAXLEN))
+        # Strong refs to fire-and-forget deliveries so they aren't GC'd mid-flight
+        self._background_deliveries = set()
+        self._channel_senders = {
+            NotificationChannel.PUSH: self._send_push_notification,
+            NotificationChannel.IN_APP: self._send_in_app_notification,
+            NotificationChannel.EMAIL: self._send_email_notification,
+            NotificationChannel.SMS: self._send_sms_notification,
+        }
+        # (user_id, title, message, agent_name) -> (created time, notification)
+        self._dedup: Dict[tuple, tuple] = {}
         
         logger.info("ProactiveNotificationEngine initialized")
     
     # ==================== SEND NOTIFICATION ====================
     
-    def send_notification(
+    async def send_notification(
         self,
         user_id: str,
         title: str,
@@ -104,8 +152,16 @@ class ProactiveNotificationEngine:
             data: Optional additional data
         
         Returns:
-            ProactiveNotification object
+            ProactiveNotification object (the earlier one if this is a duplicate)
         """
+        # Drop repeats of the same alert (e.g. an agent re-triggering)
+        now = time.time()
+        dedup_key = (user_id, title, message, agent_name)
+        seen = self._dedup.get(dedup_key)
+        if seen is not None and now - seen[0] < DEDUP_WINDOW_SECONDS:
+            logger.info(f"🔁 Duplicate notification dropped: {title}")
+            return seen[1]
+        
         # Create notification
         notification = ProactiveNotification(
             title=title,
@@ -118,21 +174,25 @@ class ProactiveNotificationEngine:
         
         # Check if should send based on user state
         if self._should_send_notification(user_id, notification):
+            # Only delivered notifications suppress repeats; batched ones may be retried.
+            # Recorded before delivery so a concurrent identical send is still dropped.
+            self._remember_for_dedup(dedup_key, now, notification)
+            
             # Determine channels
             channels = self._select_channels(urgency)
             
-            # Send through channels
-            for channel in channels:
-                self._send_through_channel(user_id, notification, channel)
+            # Send through channels concurrently; LOW urgency doesn't hold up the caller
+            if urgency == NotificationUrgency.LOW:
+                task = asyncio.create_task(self._deliver(user_id, notification, channels))
+                self._background_deliveries.add(task)
+                task.add_done_callback(self._background_deliveries.discard)
+            else:
+                await self._deliver(user_id, notification, channels)
             
             # Store notification
-            self.notifications.append(notification)
-            self.notification_history.append({
-                "user_id": user_id,
-                "notification_id": notification.id,
-                "sent_at": datetime.now(),
-                "channels": [c.value for c in channels]
-            })
+            self.by_user[user_id].append(notification)
+            self.by_id[notification.id] = notification
+            self.history_by_user[user_id].append(time.time())
             
             logger.info(f"📬 Sent {urgency.value} notification: {title}")
         else:
@@ -152,10 +212,10 @@ class ProactiveNotificationEngine:
             return True
         
         # Check notification frequency
-        recent_notifications = self._get_recent_notifications(user_id, hours=1)
+        recent_count = self._count_recent_notifications(user_id)
         
         # If user received 5+ notifications in last hour, batch non-critical ones
-        if len(recent_notifications) >= 5 and notification.urgency != NotificationUrgency.HIGH:
+        if recent_count >= 5 and notification.urgency != NotificationUrgency.HIGH:
             return False
         
         # Check user active hours (9 AM - 10 PM)
@@ -166,51 +226,52 @@ class ProactiveNotificationEngine:
         
         return True
     
-    def _select_channels(self, urgency: NotificationUrgency) -> List[NotificationChannel]:
+    def _select_channels(self, urgency: NotificationUrgency) -> Tuple[NotificationChannel, ...]:
         """Select appropriate channels based on urgency"""
-        if urgency == NotificationUrgency.CRITICAL:
-            return [NotificationChannel.PUSH, NotificationChannel.IN_APP, NotificationChannel.EMAIL]
-        elif urgency == NotificationUrgency.HIGH:
-            return [NotificationChannel.PUSH, NotificationChannel.IN_APP]
-        elif urgency == NotificationUrgency.MEDIUM:
-            return [NotificationChannel.IN_APP]
-        else:  # LOW
-            return [NotificationChannel.IN_APP]
+        return _URGENCY_CHANNELS[urgency]
     
     # ==================== CHANNEL DELIVERY ====================
     
-    def _send_through_channel(
+    async def _deliver(
+        self,
+        user_id: str,
+        notification: ProactiveNotification,
+        channels: Tuple[NotificationChannel, ...]
+    ):
+        """Fan out to all channels at once; one failing channel doesn't block the rest"""
+        results = await asyncio.gather(
+            *[self._send_through_channel(user_id, notification, c) for c in channels],
+            return_exceptions=True
+        )
+        for channel, result in zip(channels, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ {channel.value} delivery failed for {notification.id}: {result}")
+    
+    async def _send_through_channel(
         self,
         user_id: str,
         notification: ProactiveNotification,
         channel: NotificationChannel
     ):
         """Send notification through specific channel"""
-        if channel == NotificationChannel.PUSH:
-            self._send_push_notification(user_id, notification)
-        elif channel == NotificationChannel.IN_APP:
-            self._send_in_app_notification(user_id, notification)
-        elif channel == NotificationChannel.EMAIL:
-            self._send_email_notification(user_id, notification)
-        elif channel == NotificationChannel.SMS:
-            self._send_sms_notification(user_id, notification)
+        await self._channel_senders[channel](user_id, notification)
     
-    def _send_push_notification(self, user_id: str, notification: ProactiveNotification):
+    async def _send_push_notification(self, user_id: str, notification: ProactiveNotification):
         """Send push notification (implement with FCM/APNS)"""
         logger.info(f"📱 Push notification sent: {notification.title}")
         # TODO: Implement actual push notification service
     
-    def _send_in_app_notification(self, user_id: str, notification: ProactiveNotification):
+    async def _send_in_app_notification(self, user_id: str, notification: ProactiveNotification):
         """Send in-app notification (stored for display)"""
         logger.info(f"🔔 In-app notification queued: {notification.title}")
-        # Notification is already stored in self.notifications
+        # Notification is already stored in self.by_user
     
-    def _send_email_notification(self, user_id: str, notification: ProactiveNotification):
+    async def _send_email_notification(self, user_id: str, notification: ProactiveNotification):
         """Send email notification"""
         logger.info(f"📧 Email notification sent: {notification.title}")
         # TODO: Implement email service
     
-    def _send_sms_notification(self, user_id: str, notification: ProactiveNotification):
+    async def _send_sms_notification(self, user_id: str, notification: ProactiveNotification):
         """Send SMS notification (critical only)"""
         logger.info(f"📲 SMS notification sent: {notification.title}")
         # TODO: Implement SMS service
@@ -223,63 +284,68 @@ class ProactiveNotificationEngine:
         unread_only: bool = False,
         limit: int = 50
     ) -> List[Dict]:
-        """Get notifications for user"""
-        notifications = self.notifications
+        """Get notifications for user (most urgent first, then newest)"""
+        notifications = self.by_user.get(user_id, [])
         
         if unread_only:
             notifications = [n for n in notifications if not n.read]
         
-        # Sort by urgency and time
-        urgency_order = {
-            NotificationUrgency.CRITICAL: 0,
-            NotificationUrgency.HIGH: 1,
-            NotificationUrgency.MEDIUM: 2,
-            NotificationUrgency.LOW: 3
-        }
-        
-        notifications.sort(
-            key=lambda n: (urgency_order[n.urgency], n.created_at),
-            reverse=True
-        )
+        # Sort by urgency and time - only the top `limit` are needed
+        top = heapq.nsmallest(limit, notifications, key=attrgetter("_sort_key"))
         
-        return [n.to_dict() for n in notifications[:limit]]
+        return [n.to_dict() for n in top]
     
     def mark_as_read(self, notification_id: str):
         """Mark notification as read"""
-        for notification in self.notifications:
-            if notification.id == notification_id:
+        notification = self.by_id.get(notification_id)
+        if notification is not None:
+            notification.read = True
+            logger.info(f"✅ Notification marked as read: {notification_id}")
+    
+    def mark_many_as_read(self, notification_ids: List[str]) -> int:
+        """Mark several notifications as read in one call; returns how many matched"""
+        marked = 0
+        for notification_id in notification_ids:
+            notification = self.by_id.get(notification_id)
+            if notification is not None:
                 notification.read = True
-                logger.info(f"✅ Notification marked as read: {notification_id}")
-                break
+                marked += 1
+        logger.info(f"✅ {marked} notifications marked as read")
+        return marked
     
     def dismiss_notification(self, notification_id: str):
         """Dismiss notification"""
-        for notification in self.notifications:
-            if notification.id == notification_id:
-                notification.dismissed = True
-                logger.info(f"🗑️ Notification dismissed: {notification_id}")
-                break
+        notification = self.by_id.get(notification_id)
+        if notification is not None:
+            notification.dismissed = True
+            logger.info(f"🗑️ Notification dismissed: {notification_id}")
     
     def clear_all_notifications(self, user_id: str):
         """Clear all notifications for user"""
-        self.notifications = []
+        for notification in self.by_user.pop(user_id, []):
+            self.by_id.pop(notification.id, None)
         logger.info(f"🧹 All notifications cleared for user: {user_id}")
     
     # ==================== HELPER METHODS ====================
     
-    def _get_recent_notifications(self, user_id: str, hours: int = 1) -> List[Dict]:
-        """Get notifications sent in last N hours"""
-        from datetime import timedelta
-        cutoff = datetime.now() - timedelta(hours=hours)
-        
-        return [
-            h for h in self.notification_history
-            if h["user_id"] == user_id and h["sent_at"] > cutoff
-        ]
+    def _remember_for_dedup(self, key: tuple, now: float, notification: ProactiveNotification):
+        """Record a notification for de-duplication, purging expired entries as it grows"""
+        if len(self._dedup) >= DEDUP_PURGE_THRESHOLD:
+            cutoff = now - DEDUP_WINDOW_SECONDS
+            self._dedup = {k: v for k, v in self._dedup.items() if v[0] >= cutoff}
+        self._dedup[key] = (now, notification)
+    
+    def _count_recent_notifications(self, user_id: str) -> int:
+        """Count notifications sent in the last hour (amortized O(1))"""
+        history = self.history_by_user[user_id]
+        cutoff = time.time() - HISTORY_WINDOW_SECONDS
+        while history and history[0] < cutoff:
+            history.popleft()
+        return len(history)
     
     # ==================== BATCH NOTIFICATIONS ====================
     
-    def send_daily_digest(self, user_id: str):
+    async def send_daily_digest(self, user_id: str):
         """Send daily digest of batched notifications"""
         unread = self.get_notifications(user_id, unread_only=True)
         
@@ -290,7 +356,7 @@ class ProactiveNotificationEngine:
         for notif in unread[:5]:  # Top 5
             digest_message += f"• {notif['title']}\n"
         
-        self.send_notification(
+        await self.send_notification(
             user_id=user_id,
             title="📊 Your Daily Financial Digest",
             message=digest_message,
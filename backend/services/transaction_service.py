@@ -1,8 +1,14 @@
 # backend/services/transaction_service.py
 
+import asyncio
+import re
+from collections import ChainMap
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone, timedelta
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure
 
 from backend.core.database import get_transactions_collection
 from backend.models.transaction import Transaction, TransactionType
@@ -11,51 +17,125 @@ from backend.utils.logger import logger
 
 IST = timezone(timedelta(hours=5, minutes=30))
 
+# Max results returned by search_transactions
+SEARCH_LIMIT = 100
+
+# Docs per getMore when streaming, so fetch overlaps with processing
+STREAM_BATCH_SIZE = 1000
+
+# Plain string values, resolved once instead of Enum attribute + .value per use
+CREDITED = TransactionType.CREDITED.value
+DEBITED = TransactionType.DEBITED.value
+
+# Fields with an indexed lowercase copy (<field>_lc) for case-insensitive lookups
+LOWERCASE_FIELDS = ("category", "counterparty")
+
+# Exactly the fields Transaction needs (skips internal ones like category_lc)
+TRANSACTION_PROJECTION = {
+    "txn_type": 1,
+    "amount": 1,
+    "counterparty": 1,
+    "message": 1,
+    "category": 1,
+    "ai_insight": 1,
+    "compliance_alert": 1,
+    "date": 1,
+}
+
 def mongo_to_transaction(doc) -> Transaction:
     return Transaction.from_mongo(doc)
 
+def set_lowercase_fields(data: Dict[str, Any]):
+    """Keep the indexed lowercase copies (category_lc, counterparty_lc) in sync."""
+    for field in LOWERCASE_FIELDS:
+        if isinstance(data.get(field), str):
+            data[f"{field}_lc"] = data[field].lower()
+
 class TransactionService:
     def __init__(self):
         self.collection = get_transactions_collection()
         self.compliance_service = ComplianceService()
 
-    async def get_all_transactions(self) -> List[Transaction]:
-        docs = await self.collection.find({}).sort("date", -1).to_list(None)
+    async def get_all_transactions(self, skip: int = 0, limit: Optional[int] = None) -> List[Transaction]:
+        cursor = self.collection.find({}, TRANSACTION_PROJECTION).sort("date", -1).skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        docs = await cursor.to_list(None)
         return [mongo_to_transaction(doc) for doc in docs]
 
+    def get_transactions_cursor(self):
+        """Raw Motor cursor over all transactions (newest first) for streaming."""
+        return self.collection.find({}, TRANSACTION_PROJECTION).sort("date", -1).batch_size(STREAM_BATCH_SIZE)
+
     async def create_transaction(self, txn_data: Dict[str, Any]) -> Transaction:
         # Compliance check
         ai_update = await self.compliance_service.analyze_transaction(txn_data)
         txn_data["ai_insight"] = ai_update.get("insight", "")
         txn_data["compliance_alert"] = ai_update.get("compliance_alert", "")
+        set_lowercase_fields(txn_data)
         
         # Insert
         result = await self.collection.insert_one(txn_data)
         
-        # Return with ID
-        new_doc = await self.collection.find_one({"_id": result.inserted_id})
-        return mongo_to_transaction(new_doc)
+        # Return with ID - we already hold the document, no need to re-fetch it
+        txn_data["_id"] = result.inserted_id
+        return mongo_to_transaction(txn_data)
+
+    async def create_transactions_bulk(self, txns: List[Dict[str, Any]]) -> List[Transaction]:
+        """
+        Create many transactions at once (statement imports).
+        The GST/YTD check runs once per distinct year in the batch (not once
+        per row), then a single insert_many.
+        Every check sees the YTD totals from before the batch.
+        """
+        if not txns:
+            return []
+
+        compliance = self.compliance_service
+        years = list({compliance.transaction_year(txn_data) for txn_data in txns})
+        gst_results = await asyncio.gather(
+            *[compliance.check_gst_compliance(year) for year in years],
+            return_exceptions=True
+        )
+        gst_by_year = {}
+        for year, result in zip(years, gst_results):
+            if isinstance(result, Exception):
+                # Same fallback as a failed per-row check: no alert, import continues
+                logger.error(f"GST check failed for {year}: {result}")
+                result = None
+            gst_by_year[year] = result
+
+        for txn_data in txns:
+            # No I/O left per row - GST results come from gst_by_year
+            ai_update = await compliance.analyze_transaction(txn_data, gst_by_year=gst_by_year)
+            txn_data["ai_insight"] = ai_update.get("insight", "")
+            txn_data["compliance_alert"] = ai_update.get("compliance_alert", "")
+            set_lowercase_fields(txn_data)
+
+        # insert_many sets _id on each dict in place
+        await self.collection.insert_many(txns)
+        return [mongo_to_transaction(txn_data) for txn_data in txns]
 
     # ---------------------------------------------------------
     # GET BY ID
     # ---------------------------------------------------------
     async def get_transaction_by_id(self, tx_id: str) -> Optional[Transaction]:
-        try:
-            obj_id = ObjectId(tx_id)
-        except:
+        # Cheap format check instead of raising/catching InvalidId
+        if not ObjectId.is_valid(tx_id):
             return None
+        obj_id = ObjectId(tx_id)
 
-        doc = await self.collection.find_one({"_id": obj_id})
+        doc = await self.collection.find_one({"_id": obj_id}, TRANSACTION_PROJECTION)
         return mongo_to_transaction(doc) if doc else None
 
     # ---------------------------------------------------------
     # UPDATE TRANSACTION
     # ---------------------------------------------------------
     async def update_transaction(self, tx_id: str, update_data: Dict[str, Any]) -> Optional[Transaction]:
-        try:
-            obj_id = ObjectId(tx_id)
-        except:
+        # Cheap format check instead of raising/catching InvalidId
+        if not ObjectId.is_valid(tx_id):
             return None
+        obj_id = ObjectId(tx_id)
 
         old_doc = await self.collection.find_one({"_id": obj_id})
         if not old_doc:
@@ -65,29 +145,36 @@ class TransactionService:
         if "txn_type" in update_data:
             try:
                 update_data["txn_type"] = TransactionType(update_data["txn_type"]).value
-            except:
+            except ValueError:
                 update_data["txn_type"] = TransactionType.UNKNOWN.value
 
         # Merge old + new before compliance check
-        merged = old_doc | update_data
+        # ChainMap view (new values win) instead of copying the whole document;
+        # analyze_transaction only reads a few keys via .get()
+        merged = ChainMap(update_data, old_doc)
         ai_update = await self.compliance_service.analyze_transaction(merged)
 
         update_data["ai_insight"] = ai_update.get("insight", "")
         update_data["compliance_alert"] = ai_update.get("compliance_alert", "")
+        set_lowercase_fields(update_data)
 
-        await self.collection.update_one({"_id": obj_id}, {"$set": update_data})
-
-        new_doc = await self.collection.find_one({"_id": obj_id})
+        # Update + read back in one round-trip
+        new_doc = await self.collection.find_one_and_update(
+            {"_id": obj_id},
+            {"$set": update_data},
+            projection=TRANSACTION_PROJECTION,
+            return_document=ReturnDocument.AFTER
+        )
         return mongo_to_transaction(new_doc) if new_doc else None
 
     # ---------------------------------------------------------
     # DELETE TRANSACTION
     # ---------------------------------------------------------
     async def delete_transaction(self, tx_id: str) -> bool:
-        try:
-            obj_id = ObjectId(tx_id)
-        except:
+        # Cheap format check instead of raising/catching InvalidId
+        if not ObjectId.is_valid(tx_id):
             return False
+        obj_id = ObjectId(tx_id)
 
         result = await self.collection.delete_one({"_id": obj_id})
         return result.deleted_count > 0
@@ -96,22 +183,41 @@ class TransactionService:
     # SUMMARY
     # ---------------------------------------------------------
     async def get_transactions_summary(self) -> Dict[str, Any]:
-        txs = await self.get_all_transactions()
+        # One aggregation round-trip; only a single small document comes back
+        year = datetime.now(IST).year
+        year_start, year_end = datetime(year, 1, 1), datetime(year + 1, 1, 1)
 
-        total_credit = sum(t.amount for t in txs if t.txn_type == TransactionType.CREDITED.value)
-        total_debit = sum(t.amount for t in txs if t.txn_type == TransactionType.DEBITED.value)
-        net_balance = total_credit - total_debit
+        pipeline = [{"$facet": {
+            "by_type": [
+                {"$group": {"_id": "$txn_type", "sum": {"$sum": "$amount"}, "count": {"$sum": 1}}}
+            ],
+            "ytd": [
+                {"$match": {
+                    "txn_type": CREDITED,
+                    "date": {"$gte": year_start, "$lt": year_end}
+                }},
+                {"$group": {"_id": None, "sum": {"$sum": "$amount"}}}
+            ],
+            "latest_alert": [
+                {"$match": {"compliance_alert": {"$nin": [None, ""]}}},
+                {"$sort": {"date": -1}},
+                {"$limit": 1},
+                {"$project": {"_id": 0, "compliance_alert": 1}}
+            ],
+        }}]
 
-        year = datetime.now(IST).year
-        ytd_credit = sum(
-            t.amount for t in txs
-            if t.txn_type == TransactionType.CREDITED.value and t.date.year == year
-        )
+        result = (await self.collection.aggregate(pipeline).to_list(1))[0]
 
-        latest_alert = next((t.compliance_alert for t in txs if t.compliance_alert), None)
+        by_type = {row["_id"]: row for row in result["by_type"]}
+        total_credit = by_type.get(CREDITED, {}).get("sum", 0)
+        total_debit = by_type.get(DEBITED, {}).get("sum", 0)
+        net_balance = total_credit - total_debit
+
+        ytd_credit = result["ytd"][0]["sum"] if result["ytd"] else 0
+        latest_alert = result["latest_alert"][0]["compliance_alert"] if result["latest_alert"] else None
 
         return {
-            "total_transactions": len(txs),
+            "total_transactions": sum(row["count"] for row in result["by_type"]),
             "total_credit": total_credit,
             "total_debit": total_debit,
             "net_balance": net_balance,
@@ -125,28 +231,56 @@ class TransactionService:
     async def get_transactions_by_date_range(self, start: datetime, end: datetime) -> List[Transaction]:
         docs = await self.collection.find({
             "date": {"$gte": start, "$lte": end}
-        }).to_list(None)
+        }, TRANSACTION_PROJECTION).to_list(None)
 
         return [mongo_to_transaction(doc) for doc in docs]
 
     async def get_transactions_by_category(self, category: str) -> List[Transaction]:
+        # Exact match on the indexed lowercase copy instead of a case-insensitive regex
         docs = await self.collection.find({
-            "category": {"$regex": f"^{category}$", "$options": "i"}
-        }).to_list(None)
+            "category_lc": category.lower()
+        }, TRANSACTION_PROJECTION).to_list(None)
 
         return [mongo_to_transaction(doc) for doc in docs]
 
     async def search_transactions(self, query: str) -> List[Transaction]:
-        docs = await self.collection.find({
-            "$or": [
-                {"counterparty": {"$regex": query, "$options": "i"}},
-                {"message": {"$regex": query, "$options": "i"}},
-                {"category": {"$regex": query, "$options": "i"}},
-            ]
-        }).to_list(None)
+        # Word search on the text index (counterparty / message / category), best match first
+        score = {"$meta": "textScore"}
+        try:
+            docs = await self.collection.find(
+                {"$text": {"$search": query}},
+                {**TRANSACTION_PROJECTION, "score": score}
+            ).sort([("score", score)]).to_list(SEARCH_LIMIT)
+        except OperationFailure as e:
+            # Text index missing (startup couldn't build it) - use the prefix search below
+            logger.warning(f"Text search unavailable, using prefix search: {e}")
+            docs = []
+
+        # Partial words ("swig", "amaz") don't hit the text index - fall back to an
+        # anchored prefix match on category/counterparty, each served by its _lc index.
+        # Message text is only matched by whole words (a substring scan can't use an index).
+        if not docs:
+            prefix = {"$regex": f"^{re.escape(query.lower())}"}
+            docs = await self.collection.find({
+                "$or": [{"counterparty_lc": prefix}, {"category_lc": prefix}]
+            }, TRANSACTION_PROJECTION).to_list(SEARCH_LIMIT)
 
         return [mongo_to_transaction(doc) for doc in docs]
 
     async def get_categories(self) -> List[str]:
-        categories = await self.collection.distinct("category")
-        return sorted([c for c in categories if isinstance(c, str)])
\ No newline at end of file
+        # Type filter, de-dup and sort all happen server-side (category index)
+        results = await self.collection.aggregate([
+            {"$match": {"category": {"$type": "string"}}},
+            {"$group": {"_id": "$category"}},
+            {"$sort": {"_id": 1}}
+        ]).to_list(None)
+        return [doc["_id"] for doc in results]
+
+
+@lru_cache(maxsize=1)
+def get_transaction_service() -> TransactionService:
+    """
+    Shared TransactionService (one ComplianceService + collection handle per process).
+    Built lazily on first use because the collection is only available after Mongo connects.
+    """
+    return TransactionService()
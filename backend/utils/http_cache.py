@@ -0,0 +1,35 @@
+# backend/utils/http_cache.py
+
+from typing import Mapping, Optional
+
+from starlette.responses import Response
+
+# Headers a 304 must repeat from the 200 it stands in for (same set Starlette uses)
+NOT_MODIFIED_HEADERS = ("cache-control", "content-location", "date", "etag", "expires", "vary")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check with weak comparison, as GET/HEAD require:
+    handles tag lists, "*" and W/ tags (some compressing proxies weaken ETags).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == target:
+            return True
+    return False
+
+
+def not_modified(headers: Mapping[str, str]) -> Response:
+    """Empty 304 that keeps the validator/caching headers (ETag, Cache-Control, Vary...)."""
+    return Response(
+        status_code=304,
+        headers={k: v for k, v in headers.items() if k.lower() in NOT_MODIFIED_HEADERS},
+    )
@@ -0,0 +1,88 @@
+# backend/utils/static_files.py
+
+import hashlib
+import os
+import re
+import stat
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from backend.utils.http_cache import etag_matches, not_modified
+
+# Only URLs whose name changes with the content may be cached forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Everything else is kept but revalidated with the ETag (cheap 304)
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# app.3f2a9c1b.js / app-3f2a9c1b.css style content hashes in the file name
+FINGERPRINT_RE = re.compile(r"[.-][0-9a-fA-F]{8,}\.[^/]+$")
+# ?v=4 style cache busters (used by the frontend pages)
+VERSION_QUERY_RE = re.compile(rb"(?:^|&)v=[^&]+")
+
+
+@lru_cache(maxsize=1024)
+def content_etag(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Strong ETag from the file contents.
+    mtime/size are part of the cache key so an edited file is re-hashed.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return f'"{digest.hexdigest()}"'
+
+
+def is_fingerprinted(scope: Scope) -> bool:
+    """True when the URL carries a content hash or an explicit version."""
+    return bool(
+        FINGERPRINT_RE.search(scope["path"])
+        or VERSION_QUERY_RE.search(scope.get("query_string", b""))
+    )
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with browser caching:
+    - Cache-Control: immutable for 1y on fingerprinted URLs, no-cache otherwise
+    - Content-hash ETag (hashed once per file version, off the event loop)
+    - 304 when If-None-Match matches
+    """
+
+    def lookup_path(self, path: str) -> Tuple[str, Optional[os.stat_result]]:
+        # Starlette runs lookup_path in a worker thread, so warming the ETag
+        # cache here keeps file hashing out of the async request path.
+        full_path, stat_result = super().lookup_path(path)
+        if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+            content_etag(str(full_path), stat_result.st_mtime_ns, stat_result.st_size)
+        return full_path, stat_result
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        # 404.html etc. keep the default behaviour
+        if status_code != 200:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        etag = content_etag(str(full_path), stat_result.st_mtime_ns, stat_result.st_size)
+        cache_control = IMMUTABLE_CACHE_CONTROL if is_fingerprinted(scope) else REVALIDATE_CACHE_CONTROL
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+
+        if etag_matches(Headers(scope=scope).get("if-none-match"), etag):
+            return not_modified(headers)
+
+        return FileResponse(
+            full_path,
+            stat_result=stat_result,
+            headers=headers,
+            method=scope["method"],
+        )
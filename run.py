@@ -1,13 +1,6 @@
 # run.py
 
-import uvicorn
-from backend.app import app
+from backend.app import run_server
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "backend.app:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+    run_server()
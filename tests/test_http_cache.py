@@ -0,0 +1,74 @@
+import sys
+import os
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from backend.utils.http_cache import etag_matches, not_modified
+
+ETAG = '"abc123"'
+
+
+def test_etag_matches_exact_tag():
+    assert etag_matches(ETAG, ETAG)
+    assert not etag_matches('"other"', ETAG)
+
+
+def test_etag_matches_empty_header():
+    assert not etag_matches(None, ETAG)
+    assert not etag_matches("", ETAG)
+
+
+def test_etag_matches_tag_list():
+    assert etag_matches(f'"stale", {ETAG}', ETAG)
+    assert etag_matches(f'"stale",{ETAG}', ETAG)
+
+
+def test_etag_matches_wildcard():
+    assert etag_matches("*", ETAG)
+
+
+def test_etag_matches_weak_tags():
+    assert etag_matches(f"W/{ETAG}", ETAG)
+    assert etag_matches(ETAG, f"W/{ETAG}")
+
+
+def test_not_modified_keeps_cache_headers_only():
+    response = not_modified({
+        "ETag": ETAG,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        "Content-Type": "application/json",
+        "Content-Length": "42",
+    })
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == ETAG
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert "content-type" not in response.headers
+
+
+def test_json_etag_middleware_304_keeps_vary():
+    from backend import app as app_module
+
+    app = FastAPI()
+    app.middleware("http")(app_module.json_etag_middleware)
+
+    @app.get("/data")
+    async def data():
+        return JSONResponse({"balance": 100}, headers={"Vary": "Accept-Encoding"})
+
+    client = TestClient(app)
+    etag = client.get("/data").headers["etag"]
+
+    response = client.get("/data", headers={"If-None-Match": f"W/{etag}"})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.headers["vary"] == "Accept-Encoding"
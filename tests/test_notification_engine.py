@@ -0,0 +1,110 @@
+import sys
+import os
+import asyncio
+from datetime import datetime
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from backend.services import proactive_notification_engine as engine_module
+from backend.services.proactive_notification_engine import (
+    DEDUP_WINDOW_SECONDS,
+    NotificationUrgency,
+    ProactiveNotificationEngine,
+)
+
+
+class _Noon(datetime):
+    """Fixed time inside active hours so quiet-hours batching doesn't kick in"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 1, 15, 12, 0, 0, tzinfo=tz)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(engine_module, "datetime", _Noon)
+    return ProactiveNotificationEngine()
+
+
+def send(engine, user_id="user_1", title="Budget alert", message="Food budget at 90%",
+         urgency=NotificationUrgency.MEDIUM, agent_name="budget_agent"):
+    return asyncio.run(engine.send_notification(
+        user_id=user_id,
+        title=title,
+        message=message,
+        urgency=urgency,
+        agent_name=agent_name,
+    ))
+
+
+def test_duplicate_within_window_is_dropped(engine):
+    first = send(engine)
+    second = send(engine)
+
+    assert second is first
+    assert len(engine.by_user["user_1"]) == 1
+
+
+def test_duplicate_after_window_is_sent_again(engine, monkeypatch):
+    first = send(engine)
+
+    later = engine_module.time.time() + DEDUP_WINDOW_SECONDS + 1
+    monkeypatch.setattr(engine_module.time, "time", lambda: later)
+    second = send(engine)
+
+    assert second is not first
+    assert second.id in engine.by_id
+    assert len(engine.by_user["user_1"]) == 2
+
+
+def test_different_users_are_not_deduplicated(engine):
+    first = send(engine, user_id="user_1")
+    second = send(engine, user_id="user_2")
+
+    assert second is not first
+    assert second.id in engine.by_id
+
+
+def test_batched_notification_can_be_retried(engine):
+    # Five sends in the hour trip the frequency cap for MEDIUM urgency
+    for i in range(5):
+        send(engine, title=f"Alert {i}")
+    batched = send(engine, title="Held back")
+    assert batched.id not in engine.by_id
+
+    # Once the cap clears, a retry inside the dedup window must be delivered, not dropped
+    engine.history_by_user["user_1"].clear()
+    retried = send(engine, title="Held back")
+
+    assert retried is not batched
+    assert retried.id in engine.by_id
+
+
+def test_clear_all_notifications_only_clears_that_user(engine):
+    mine = send(engine, user_id="user_1")
+    theirs = send(engine, user_id="user_2")
+
+    engine.clear_all_notifications("user_1")
+
+    assert engine.get_notifications("user_1") == []
+    assert mine.id not in engine.by_id
+    assert theirs.id in engine.by_id
+    assert [n["id"] for n in engine.get_notifications("user_2")] == [theirs.id]
+
+
+def test_mark_many_as_read(engine):
+    first = send(engine, title="First")
+    second = send(engine, title="Second")
+    third = send(engine, title="Third")
+
+    marked = engine.mark_many_as_read([first.id, third.id, "notif_missing"])
+
+    assert marked == 2
+    assert first.read and third.read
+    assert not second.read
+    unread = engine.get_notifications("user_1", unread_only=True)
+    assert [n["id"] for n in unread] == [second.id]
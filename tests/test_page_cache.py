@@ -0,0 +1,72 @@
+import sys
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from backend import app as app_module
+
+INDEX_HTML = b"<html><body>FinBuddy</body></html>"
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    (tmp_path / "index.html").write_bytes(INDEX_HTML)
+    monkeypatch.setattr(app_module, "FRONTEND_DIR", tmp_path)
+    app_module.load_page_cache()
+    yield TestClient(app_module.app)  # no lifespan - pages only, no MongoDB
+    app_module._page_cache.clear()
+    app_module._page_files.clear()
+
+
+def test_cached_page_is_served_with_etag(client):
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert response.content == INDEX_HTML
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["cache-control"] == app_module.PAGE_CACHE_CONTROL
+
+
+def test_matching_etag_returns_304(client):
+    etag = client.get("/").headers["etag"]
+
+    response = client.get("/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_stale_etag_returns_page(client):
+    response = client.get("/", headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.content == INDEX_HTML
+
+
+def test_unknown_route_falls_back_to_index(client):
+    etag = client.get("/").headers["etag"]
+
+    response = client.get("/some/client/route", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+def test_missing_page_returns_fallback(client):
+    response = client.get("/dashboard")
+
+    assert response.status_code == 200
+    assert response.json() == {"message": "Dashboard not available"}
+
+
+def test_weak_etag_returns_304(client):
+    etag = client.get("/").headers["etag"]
+
+    response = client.get("/", headers={"If-None-Match": f'"stale", W/{etag}'})
+
+    assert response.status_code == 304
+    assert response.headers["cache-control"] == app_module.PAGE_CACHE_CONTROL
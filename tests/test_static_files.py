@@ -0,0 +1,86 @@
+import sys
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from backend.utils.static_files import (
+    CachedStaticFiles,
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+)
+
+ASSET_BODY = b"console.log('finbuddy');\n" * 100
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "app.js").write_bytes(ASSET_BODY)
+    (tmp_path / "app.3f2a9c1b.js").write_bytes(ASSET_BODY)
+    app = FastAPI()
+    app.mount("/assets", CachedStaticFiles(directory=str(tmp_path)), name="assets")
+    return TestClient(app)
+
+
+def test_get_returns_body_with_etag(client):
+    response = client.get("/assets/app.js")
+
+    assert response.status_code == 200
+    assert response.content == ASSET_BODY
+    assert response.headers["etag"].startswith('"')
+
+
+def test_matching_etag_returns_304(client):
+    etag = client.get("/assets/app.js").headers["etag"]
+
+    response = client.get("/assets/app.js", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_etag_in_list_returns_304(client):
+    etag = client.get("/assets/app.js").headers["etag"]
+
+    response = client.get("/assets/app.js", headers={"If-None-Match": f'"stale", {etag}'})
+
+    assert response.status_code == 304
+
+
+def test_stale_etag_returns_full_body(client):
+    response = client.get("/assets/app.js", headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.content == ASSET_BODY
+
+
+def test_head_sends_headers_without_body(client):
+    response = client.head("/assets/app.js")
+
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["content-length"] == str(len(ASSET_BODY))
+    assert "etag" in response.headers
+
+
+def test_unversioned_asset_is_revalidated(client):
+    response = client.get("/assets/app.js")
+
+    assert response.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+
+
+def test_fingerprinted_asset_is_immutable(client):
+    assert client.get("/assets/app.3f2a9c1b.js").headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert client.get("/assets/app.js?v=4").headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+
+def test_weak_etag_and_wildcard_return_304(client):
+    etag = client.get("/assets/app.js").headers["etag"]
+
+    assert client.get("/assets/app.js", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    assert client.get("/assets/app.js", headers={"If-None-Match": "*"}).status_code == 304